@@ -1,12 +1,23 @@
 import os
 import json
+import asyncio
+import functools
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+import operator
+import socket
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Any, AsyncIterator, List, Mapping, Optional, Set
 
 from dotenv import load_dotenv
-import requests
-from slack_bolt import App
-from slack_bolt.adapter.socket_mode import SocketModeHandler
+import aiohttp
+import httpx
+from cachetools import TTLCache
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, model_validator
+from slack_sdk.errors import SlackApiError
+from slack_bolt.async_app import AsyncApp
+from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
 
 # Load environment from .env if present (local dev convenience)
 load_dotenv()
@@ -26,26 +37,145 @@ load_dotenv()
 # SNOWFLAKE_SCHEMA=***
 # Optional timeout
 # CORTEX_TIMEOUT_SECONDS=60
+# Optional streaming (set to true if your agent emits SSE or NDJSON chunks)
+# CORTEX_STREAM=false
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("cortex_slack_app")
 
 # Initializes your app with your bot token
-app = App(token=os.environ.get("SLACK_BOT_TOKEN"))
+app = AsyncApp(token=os.environ.get("SLACK_BOT_TOKEN"))
 
-CORTEX_AGENT_URL = os.environ.get("CORTEX_AGENT_URL")
-CORTEX_API_KEY = os.environ.get("CORTEX_API_KEY")
-CORTEX_TIMEOUT_SECONDS = int(os.environ.get("CORTEX_TIMEOUT_SECONDS", "60"))
+_SNOWFLAKE_CONTEXT_KEYS = (
+    "SNOWFLAKE_ACCOUNT",
+    "SNOWFLAKE_USER",
+    "SNOWFLAKE_WAREHOUSE",
+    "SNOWFLAKE_DATABASE",
+    "SNOWFLAKE_SCHEMA",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class _Cfg:
+    """Process-wide settings, read from the environment once at import."""
+
+    cortex_url: str
+    cortex_key: str
+    timeout: int
+    stream: bool
+    snowflake: Mapping[str, str]
+
+
+def _load_config() -> _Cfg:
+    cortex_url = os.environ.get("CORTEX_AGENT_URL")
+    cortex_key = os.environ.get("CORTEX_API_KEY")
+    if not cortex_url or not cortex_key:
+        raise ValueError("CORTEX_AGENT_URL and CORTEX_API_KEY must be set in environment variables")
+    snowflake = {}
+    for key in _SNOWFLAKE_CONTEXT_KEYS:
+        val = os.environ.get(key)
+        if val:
+            snowflake[key.lower()] = val
+    return _Cfg(
+        cortex_url=cortex_url,
+        cortex_key=cortex_key,
+        timeout=int(os.environ.get("CORTEX_TIMEOUT_SECONDS", "60")),
+        stream=os.environ.get("CORTEX_STREAM", "false").lower() in ("1", "true", "yes"),
+        snowflake=MappingProxyType(snowflake),
+    )
+
+
+# Fail fast on misconfiguration instead of on the first /cortex submission
+_CFG = _load_config()
+# Minimum seconds between chat_update calls while streaming (Slack rate limits)
+CORTEX_STREAM_UPDATE_INTERVAL = 0.8
+
+# Idle pooled connections are kept this long; while Cortex is in use the
+# warmup loop re-touches the host just before they would expire.
+CORTEX_KEEPALIVE_SECONDS = 75
+CORTEX_WARMUP_INTERVAL = CORTEX_KEEPALIVE_SECONDS - 10
+
+# Loop time of the most recent Cortex request, used to stop warming when idle
+_last_cortex_call = 0.0
+
+
+def _mark_cortex_call() -> None:
+    global _last_cortex_call
+    _last_cortex_call = asyncio.get_running_loop().time()
+
+# Retries: connection failures are retried by the transport; 502/503/504 and
+# resets on a pooled socket the server already dropped are retried for POSTs.
+CORTEX_CONNECT_RETRIES = 3
+CORTEX_READ_RETRIES = 2
+CORTEX_RETRY_BACKOFF = 0.25
+CORTEX_RETRY_STATUSES = frozenset((502, 503, 504))
+
+
+def _keepalive_socket_options() -> List[tuple]:
+    """TCP keepalive probes so the OS reaps idle sockets a NAT or server dropped."""
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    for name, value in (("TCP_KEEPIDLE", 30), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3)):
+        if hasattr(socket, name):  # not all platforms expose every knob
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+# Shared HTTP/2 client so concurrent Cortex calls multiplex over one warm
+# connection instead of opening (and handshaking) one per in-flight request.
+_cortex_client: Optional[httpx.AsyncClient] = None
+
+
+def get_session() -> httpx.AsyncClient:
+    global _cortex_client
+    if _cortex_client is None or _cortex_client.is_closed:
+        _cortex_client = httpx.AsyncClient(
+            http2=True,
+            headers={
+                "Authorization": f"Bearer {_CFG.cortex_key}",
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            },
+            timeout=httpx.Timeout(_CFG.timeout),
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=CORTEX_CONNECT_RETRIES,
+                socket_options=_keepalive_socket_options(),
+                limits=httpx.Limits(
+                    max_connections=40,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=CORTEX_KEEPALIVE_SECONDS,
+                ),
+            ),
+        )
+    return _cortex_client
+
+# ---------- JSON Helpers ----------
+
+try:
+    import orjson
+
+    _json_dumps = orjson.dumps
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _json_loads = json.loads
+
+
+def _json_dumps_str(obj: Any) -> str:
+    return _json_dumps(obj).decode("utf-8")
 
 # ---------- UI Helpers ----------
 
-def build_cortex_modal(initial_query: str = "") -> Dict[str, Any]:
+def _cortex_modal_template() -> Dict[str, Any]:
     return {
         "type": "modal",
         "callback_id": "cortex_modal_submit",
         "title": {"type": "plain_text", "text": "Cortex Agent"},
         "submit": {"type": "plain_text", "text": "Ask"},
         "close": {"type": "plain_text", "text": "Cancel"},
+        "private_metadata": "",
         "blocks": [
             {
                 "type": "input",
@@ -55,7 +185,7 @@ def build_cortex_modal(initial_query: str = "") -> Dict[str, Any]:
                     "type": "plain_text_input",
                     "action_id": "query_input",
                     "placeholder": {"type": "plain_text", "text": "Ask your data assistant..."},
-                    "initial_value": initial_query,
+                    "initial_value": "",
                     "multiline": True,
                 },
             },
@@ -75,6 +205,39 @@ def build_cortex_modal(initial_query: str = "") -> Dict[str, Any]:
     }
 
 
+# `/cortex --fresh ...` skips the answer cache; carried via private_metadata
+_FRESH_FLAG = "--fresh"
+
+# Serialized once; each modal is re-parsed from this and only the initial
+# query is patched in, rather than rebuilding the nested dict literal.
+_MODAL_TEMPLATE_JSON = _json_dumps_str(_cortex_modal_template())
+
+# Only short queries (slash-command text, the empty modal) repeat often enough
+# to memoize; long message-shortcut text would just fill the cache.
+_MODAL_CACHE_MAX_QUERY_LEN = 200
+
+
+def _render_modal(initial_query: str, fresh: bool) -> Dict[str, Any]:
+    modal = _json_loads(_MODAL_TEMPLATE_JSON)
+    modal["blocks"][0]["element"]["initial_value"] = initial_query
+    if fresh:
+        modal["private_metadata"] = _FRESH_FLAG
+    return modal
+
+
+@functools.lru_cache(maxsize=256)
+def _cached_modal_json(initial_query: str, fresh: bool) -> str:
+    return _json_dumps_str(_render_modal(initial_query, fresh))
+
+
+def build_cortex_modal(initial_query: str = "", *, fresh: bool = False) -> Dict[str, Any]:
+    if len(initial_query) > _MODAL_CACHE_MAX_QUERY_LEN:
+        return _render_modal(initial_query, fresh)
+    # Re-parsing the cached JSON hands each caller its own dict and is much
+    # cheaper than rebuilding the nested structure for repeat queries.
+    return _json_loads(_cached_modal_json(initial_query, fresh))
+
+
 def build_home_view() -> Dict[str, Any]:
     return {
         "type": "home",
@@ -110,20 +273,80 @@ def build_home_view() -> Dict[str, Any]:
         ],
     }
 
+def build_hello_blocks(user_id: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            "type": "section",
+            "text": {"type": "mrkdwn", "text": f"Hey there <@{user_id}>! Ask me with /cortex"},
+            "accessory": {
+                "type": "button",
+                "text": {"type": "plain_text", "text": "Open Cortex"},
+                "action_id": "open_cortex_modal_from_message",
+                "style": "primary",
+            },
+        }
+    ]
+
+
+# The hello reply fires for every matching message, so it is rendered from a
+# pre-serialized template with only the user mention substituted.
+_HELLO_USER_PLACEHOLDER = "__USER__"
+_HELLO_TEMPLATE_JSON = json.dumps(build_hello_blocks(_HELLO_USER_PLACEHOLDER))
+
+
+_HELLO_TEXT = "Hey there <@%s>!"
+_get_user = operator.itemgetter("user")
+
+
+def _hello_blocks_for(user_id: str) -> List[Dict[str, Any]]:
+    return _json_loads(_HELLO_TEMPLATE_JSON.replace(_HELLO_USER_PLACEHOLDER, user_id))
+
+
+class _ViewState(BaseModel):
+    """Validated fields from the Cortex modal's ``view.state.values``."""
+
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    question: str = Field(min_length=1)
+    context: Optional[str] = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def _from_state_values(cls, values: Any) -> Any:
+        if not isinstance(values, dict):
+            return values
+        query = values.get("query_block") or {}
+        ctx = values.get("context_block") or {}
+        return {
+            "question": (query.get("query_input") or {}).get("value"),
+            "context": (ctx.get("context_input") or {}).get("value"),
+        }
+
+
+# Constant views, built once at import and shared across events. The Slack
+# client serializes these without mutating them.
+_HOME_VIEW = build_home_view()
+_EMPTY_MODAL = build_cortex_modal("")
+
+# ---------- Snowflake Optional Helper (example) ----------
+
+def build_snowflake_context() -> Mapping[str, str]:
+    return _CFG.snowflake
+
 # ---------- Cortex API Client ----------
 
-def call_cortex_agent(question: str, *, context: Optional[str] = None, user_id: Optional[str] = None, channel_id: Optional[str] = None) -> Dict[str, Any]:
-    if not CORTEX_AGENT_URL or not CORTEX_API_KEY:
-        raise ValueError("CORTEX_AGENT_URL and CORTEX_API_KEY must be set in environment variables")
+# The fields that never change for this process are serialized once and
+# spliced into each request body, so only the per-request part is encoded.
+_STATIC_PAYLOAD: Dict[str, Any] = {"source": "slack"}
+if build_snowflake_context():
+    _STATIC_PAYLOAD["snowflake"] = dict(build_snowflake_context())
+_STATIC_PAYLOAD_BYTES = _json_dumps(_STATIC_PAYLOAD)[1:-1]
 
-    headers = {
-        "Authorization": f"Bearer {CORTEX_API_KEY}",
-        "Content-Type": "application/json",
-        "Accept": "application/json",
-    }
+
+def _build_cortex_payload(question: str, context: Optional[str], user_id: Optional[str], channel_id: Optional[str]) -> Dict[str, Any]:
+    """Per-request payload fields; see ``_encode_cortex_payload`` for the rest."""
     payload: Dict[str, Any] = {
         "question": question,
-        "source": "slack",
         "metadata": {
             "slack_user_id": user_id,
             "slack_channel_id": channel_id,
@@ -131,142 +354,348 @@ def call_cortex_agent(question: str, *, context: Optional[str] = None, user_id:
     }
     if context:
         payload["context"] = context
-
-    logger.info("Calling Cortex Agent: %s", CORTEX_AGENT_URL)
-    resp = requests.post(CORTEX_AGENT_URL, headers=headers, json=payload, timeout=CORTEX_TIMEOUT_SECONDS)
+    return payload
+
+
+def _encode_cortex_payload(payload: Dict[str, Any]) -> bytes:
+    # payload always has "question", so the dumped object is never "{}"
+    return b"{" + _STATIC_PAYLOAD_BYTES + b"," + _json_dumps(payload)[1:]
+
+
+# Bounds concurrent Cortex HTTP calls; cache hits never wait on it
+CORTEX_MAX_CONCURRENCY = 32
+_cortex_slots = asyncio.Semaphore(CORTEX_MAX_CONCURRENCY)
+
+# Short-lived answer cache for repeat questions. Only touched from the event
+# loop thread, so no lock is needed around get/set.
+CORTEX_CACHE_TTL_SECONDS = 300
+_cortex_cache: TTLCache = TTLCache(maxsize=2048, ttl=CORTEX_CACHE_TTL_SECONDS)
+
+
+def _cortex_cache_key(question: str, context: Optional[str], user_id: Optional[str]) -> bytes:
+    raw = "|".join((question.strip().lower(), context or "", user_id or ""))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).digest()
+
+
+async def call_cortex_agent(question: str, *, context: Optional[str] = None, user_id: Optional[str] = None, channel_id: Optional[str] = None, bypass_cache: bool = False) -> Dict[str, Any]:
+    key = _cortex_cache_key(question, context, user_id)
+    if not bypass_cache:
+        cached = _cortex_cache.get(key)
+        if cached is not None:
+            return cached
+
+    payload = _build_cortex_payload(question, context, user_id, channel_id)
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Calling Cortex Agent: %s", _CFG.cortex_url)
+    _mark_cortex_call()
+    body = _encode_cortex_payload(payload)
+    attempt = 0
+    async with _cortex_slots:
+        while True:
+            try:
+                resp = await get_session().post(_CFG.cortex_url, content=body)
+                if resp.status_code not in CORTEX_RETRY_STATUSES or attempt >= CORTEX_READ_RETRIES:
+                    break
+            except (httpx.RemoteProtocolError, httpx.ReadError):
+                if attempt >= CORTEX_READ_RETRIES:
+                    raise
+            attempt += 1
+            await asyncio.sleep(CORTEX_RETRY_BACKOFF * (2 ** (attempt - 1)))
     resp.raise_for_status()
-    return resp.json()
+    result = _json_loads(resp.content)
+    _cortex_cache[key] = result
+    return result
+
+
+async def stream_cortex_agent(question: str, *, context: Optional[str] = None, user_id: Optional[str] = None, channel_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+    """Yield Cortex response chunks as they arrive (SSE ``data:`` lines or NDJSON)."""
+    payload = _build_cortex_payload(question, context, user_id, channel_id)
+    payload["stream"] = True
+
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Streaming from Cortex Agent: %s", _CFG.cortex_url)
+    _mark_cortex_call()
+    async with _cortex_slots, get_session().stream(
+        "POST",
+        _CFG.cortex_url,
+        content=_encode_cortex_payload(payload),
+        headers={"Accept": "text/event-stream, application/x-ndjson"},
+    ) as resp:
+        resp.raise_for_status()
+        async for raw in resp.aiter_lines():
+            line = raw.strip()
+            if line.startswith("data:"):
+                line = line[5:].strip()
+            if not line.startswith("{"):
+                if line == "[DONE]":
+                    break
+                continue  # blank keep-alives, SSE comments and event names
+            yield _json_loads(line)
+
+# ---------- Slack Helpers ----------
+
+# IM channel IDs are stable per user, so repeat askers skip conversations.open
+_dm_channel_cache: TTLCache = TTLCache(maxsize=10_000, ttl=24 * 3600)
+
+
+async def open_dm(client, user_id: str) -> str:
+    channel = _dm_channel_cache.get(user_id)
+    if channel:
+        return channel
+    dm = await client.conversations_open(users=user_id)
+    channel = dm["channel"]["id"]
+    _dm_channel_cache[user_id] = channel
+    return channel
+
+async def post_dm(client, user_id: str, **kwargs) -> str:
+    """Post to the user's DM, re-opening it once if the cached channel is gone."""
+    channel = await open_dm(client, user_id)
+    try:
+        await client.chat_postMessage(channel=channel, **kwargs)
+    except SlackApiError as e:
+        if e.response.get("error") != "channel_not_found":
+            raise
+        _dm_channel_cache.pop(user_id, None)
+        channel = await open_dm(client, user_id)
+        await client.chat_postMessage(channel=channel, **kwargs)
+    return channel
 
-# ---------- Snowflake Optional Helper (example) ----------
 
-def build_snowflake_context() -> Dict[str, Any]:
-    context: Dict[str, Any] = {}
-    for key in [
-        "SNOWFLAKE_ACCOUNT",
-        "SNOWFLAKE_USER",
-        "SNOWFLAKE_WAREHOUSE",
-        "SNOWFLAKE_DATABASE",
-        "SNOWFLAKE_SCHEMA",
-    ]:
-        val = os.environ.get(key)
-        if val:
-            context[key.lower()] = val
-    return context
+def _log_failure(what: str, e: Exception) -> None:
+    if logger.isEnabledFor(logging.ERROR):
+        logger.error("%s failed: %s", what, e, exc_info=True)
+
+
+def _slack_safe(op):
+    """Log and swallow failures from a listener instead of re-raising to Bolt."""
+
+    @functools.wraps(op)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await op(*args, **kwargs)
+        except Exception as e:
+            _log_failure(op.__name__, e)
+
+    return wrapper
 
 # ---------- Event Handlers ----------
 
 @app.event("app_home_opened")
-def update_home_tab(client, event, logger):
-    try:
-        client.views_publish(user=event["user"], view=build_home_view())
-    except Exception as e:
-        logger.exception("Failed to publish home: %s", e)
+@_slack_safe
+async def update_home_tab(client, event):
+    await client.views_publish(user=event["user"], view=_HOME_VIEW)
 
 
 # Slash command: /cortex opens a modal
 @app.command("/cortex")
-def handle_cortex_command(ack, body, client, logger):
-    ack()
+@_slack_safe
+async def handle_cortex_command(ack, body, client):
+    await ack()
     trigger_id = body.get("trigger_id")
     text = (body.get("text") or "").strip()
+    fresh = text == _FRESH_FLAG or text.startswith(_FRESH_FLAG + " ")
+    if fresh:
+        text = text[len(_FRESH_FLAG):].strip()
 
-    modal = build_cortex_modal(initial_query=text)
-    try:
-        client.views_open(trigger_id=trigger_id, view=modal)
-    except Exception as e:
-        logger.exception("Failed to open Cortex modal: %s", e)
+    modal = build_cortex_modal(initial_query=text, fresh=fresh) if text or fresh else _EMPTY_MODAL
+    await client.views_open(trigger_id=trigger_id, view=modal)
 
 
-# Modal submission
-@app.view("cortex_modal_submit")
-def handle_modal_submission(ack, body, client, logger):
-    state_values = body["view"]["state"]["values"]
-    question = state_values["query_block"]["query_input"]["value"].strip()
-    context = state_values.get("context_block", {}).get("context_input", {}).get("value")
+# Background work scheduled after the modal is acked. Strong references keep
+# tasks alive until done.
+_background_tasks: Set[asyncio.Task] = set()
+
+
+def _spawn(coro) -> asyncio.Task:
+    task = asyncio.get_running_loop().create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    if len(_background_tasks) > CORTEX_MAX_CONCURRENCY:
+        logger.warning("Cortex backlog: %d submissions pending", len(_background_tasks))
+    return task
 
-    ack(response_action="clear")
 
-    user_id = body.get("user", {}).get("id")
+def _failure_text(e: Exception) -> str:
+    return f"Sorry, I couldn't complete that request: {e}"
+
+
+async def _stream_submission(client, question: str, context: Optional[str], user_id: Optional[str]) -> None:
+    dm_channel = await open_dm(client, user_id)
+    placeholder = await client.chat_postMessage(channel=dm_channel, text="_Thinking…_")
+    ts = placeholder["ts"]
 
     try:
-        result = call_cortex_agent(question, context=context, user_id=user_id)
+        loop = asyncio.get_running_loop()
+        last_update = loop.time()
+        parts: List[str] = []
+        blocks = None
+        async for chunk in stream_cortex_agent(question, context=context, user_id=user_id):
+            parts.append(chunk.get("delta") or chunk.get("text") or "")
+            if isinstance(chunk.get("blocks"), list):
+                blocks = chunk["blocks"]
+            now = loop.time()
+            if parts[-1] and now - last_update >= CORTEX_STREAM_UPDATE_INTERVAL:
+                await client.chat_update(channel=dm_channel, ts=ts, text="".join(parts))
+                last_update = now
+
+        answer = "".join(parts) or "No answer returned."
+        if blocks:
+            await client.chat_update(channel=dm_channel, ts=ts, blocks=blocks, text=answer)
+        else:
+            await client.chat_update(channel=dm_channel, ts=ts, text=answer)
+    except Exception as e:
+        # The placeholder exists, so replace it (and any partial answer) with
+        # the error rather than leaving it looking finished or posting anew.
+        _log_failure("Cortex stream", e)
+        try:
+            await client.chat_update(channel=dm_channel, ts=ts, text=_failure_text(e))
+        except Exception:
+            pass
+
+
+async def _process_submission(client, question: str, context: Optional[str], user_id: Optional[str], fresh: bool = False) -> None:
+    try:
+        if _CFG.stream:
+            await _stream_submission(client, question, context, user_id)
+            return
+
+        result = await call_cortex_agent(question, context=context, user_id=user_id, bypass_cache=fresh)
         answer = result.get("answer") or result.get("message") or "No answer returned."
         rich = result.get("rich_text")
         blocks = result.get("blocks")
 
-        # Open a DM with the user to deliver results
-        dm = client.conversations_open(users=user_id)
-        dm_channel = dm["channel"]["id"]
-
+        # Deliver results in a DM with the user
         if blocks and isinstance(blocks, list):
-            client.chat_postMessage(channel=dm_channel, blocks=blocks, text=answer)
+            await post_dm(client, user_id, blocks=blocks, text=answer)
         else:
             text_out = answer if not rich else rich
-            client.chat_postMessage(channel=dm_channel, text=text_out)
+            await post_dm(client, user_id, text=text_out)
 
     except Exception as e:
-        logger.exception("Cortex call failed: %s", e)
+        _log_failure("Cortex call", e)
+        if isinstance(e, SlackApiError) and e.response.get("error") == "channel_not_found":
+            _dm_channel_cache.pop(user_id, None)
         try:
-            dm = client.conversations_open(users=user_id)
-            dm_channel = dm["channel"]["id"]
-            client.chat_postMessage(channel=dm_channel, text=f"Sorry, I couldn't complete that request: {e}")
+            dm_channel = await open_dm(client, user_id)
+            await client.chat_postMessage(channel=dm_channel, text=_failure_text(e))
         except Exception:
             pass
 
 
+def _get_user_id(body: Dict[str, Any]) -> Optional[str]:
+    return (body.get("user") or {}).get("id")
+
+
+# Modal submission
+@app.view("cortex_modal_submit")
+async def handle_modal_submission(ack, body, client):
+    try:
+        state = _ViewState.model_validate(body["view"]["state"]["values"])
+    except ValidationError as e:
+        logger.warning("Invalid Cortex modal submission: %s", e)
+        await ack(response_action="errors", errors={"query_block": "Please enter a question."})
+        return
+
+    await ack(response_action="clear")
+
+    user_id = _get_user_id(body)
+    fresh = body["view"].get("private_metadata") == _FRESH_FLAG
+
+    # Return to Bolt right away; the Cortex round-trip runs on its own task
+    _spawn(_process_submission(client, state.question, state.context, user_id, fresh))
+
+
 # Message shortcut: analyze selected message
 @app.shortcut("cortex_message_shortcut")
-def handle_message_shortcut(ack, body, client, logger):
-    ack()
+@_slack_safe
+async def handle_message_shortcut(ack, body, client):
+    await ack()
     message_text = body.get("message", {}).get("text", "")
     trigger_id = body.get("trigger_id")
     modal = build_cortex_modal(initial_query=message_text)
-    try:
-        client.views_open(trigger_id=trigger_id, view=modal)
-    except Exception as e:
-        logger.exception("Failed to open modal from shortcut: %s", e)
+    await client.views_open(trigger_id=trigger_id, view=modal)
 
 
 # Friendly 'hello' example maintained
 @app.message("hello")
-def message_hello(message, say):
-    say(
-        blocks=[
-            {
-                "type": "section",
-                "text": {"type": "mrkdwn", "text": f"Hey there <@{message['user']}>! Ask me with /cortex"},
-                "accessory": {
-                    "type": "button",
-                    "text": {"type": "plain_text", "text": "Open Cortex"},
-                    "action_id": "open_cortex_modal_from_message",
-                    "style": "primary",
-                },
-            }
-        ],
-        text=f"Hey there <@{message['user']}>!",
-    )
+async def message_hello(message, say):
+    user_id = _get_user(message)
+    await say(blocks=_hello_blocks_for(user_id), text=_HELLO_TEXT % user_id)
 
 
 @app.action("open_cortex_modal_from_message")
-def open_cortex_modal_from_message(ack, body, client, logger):
-    ack()
+@_slack_safe
+async def open_cortex_modal_from_message(ack, body, client):
+    await ack()
     trigger_id = body.get("trigger_id")
-    try:
-        client.views_open(trigger_id=trigger_id, view=build_cortex_modal())
-    except Exception as e:
-        logger.exception("Failed to open Cortex modal from message action: %s", e)
+    await client.views_open(trigger_id=trigger_id, view=_EMPTY_MODAL)
 
 
 @app.action("open_cortex_modal_from_home")
-def open_cortex_modal_from_home(ack, body, client, logger):
-    ack()
+@_slack_safe
+async def open_cortex_modal_from_home(ack, body, client):
+    await ack()
     trigger_id = body.get("trigger_id")
-    try:
-        client.views_open(trigger_id=trigger_id, view=build_cortex_modal())
-    except Exception as e:
-        logger.exception("Failed to open Cortex modal from home action: %s", e)
+    await client.views_open(trigger_id=trigger_id, view=_EMPTY_MODAL)
 
 
 # Start your app
+async def _warmup() -> None:
+    """Keep a TLS connection to the Cortex host open in the pool.
+
+    Runs once at startup so the first request skips the handshake, then again
+    before keep-alive expiry only if Cortex was called within that window.
+    The first failure of a run is logged at warning so a bad URL or key shows.
+    """
+    loop = asyncio.get_running_loop()
+    warned = False
+    while True:
+        try:
+            resp = await get_session().head(_CFG.cortex_url, timeout=5)
+            # 405 is fine: the endpoint rejects HEAD but the connection is warm
+            if resp.is_success or resp.status_code == 405:
+                warned = False
+            elif not warned:
+                logger.warning("Cortex warmup got HTTP %s from %s", resp.status_code, _CFG.cortex_url)
+                warned = True
+        except Exception as e:
+            if not warned:
+                logger.warning("Cortex warmup failed: %s", e)
+                warned = True
+            else:
+                logger.debug("Cortex warmup failed: %s", e)
+        await asyncio.sleep(CORTEX_WARMUP_INTERVAL)
+        while loop.time() - _last_cortex_call > CORTEX_KEEPALIVE_SECONDS:
+            await asyncio.sleep(CORTEX_WARMUP_INTERVAL)
+
+
+def _install_slack_session() -> aiohttp.ClientSession:
+    """Give the Slack Web API client one shared aiohttp session.
+
+    Bolt hands each listener a client built from ``app.client``, including its
+    session. Without one, slack_sdk opens a new session (and TLS connection)
+    per API call and encodes bodies with stdlib json.
+    """
+    session = aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=app.client.timeout),
+        json_serialize=_json_dumps_str,
+    )
+    app.client.session = session
+    return session
+
+
+async def main():
+    slack_session = _install_slack_session()
+    warmup = asyncio.create_task(_warmup())
+    try:
+        await AsyncSocketModeHandler(app, os.environ["SLACK_APP_TOKEN"]).start_async()
+    finally:
+        warmup.cancel()
+        await slack_session.close()
+        if _cortex_client is not None:
+            await _cortex_client.aclose()
+
+
 if __name__ == "__main__":
-    SocketModeHandler(app, os.environ["SLACK_APP_TOKEN"]).start()
+    asyncio.run(main())